@@ -66,13 +66,53 @@ def is_data_valid(data):
 #-----------------------------------------------------------------------------------------------------------------------
 def rmse(predictions, targets):
     """
-    Root mean square error
-    
-    :param predictions: np.ndarray
-    :param targets: np.ndarray
-    :return: np.ndarray
+    Root mean square error. Masked elements (in either array) are skipped, and any NaN 
+    among the remaining elements results in a NaN.
+
+    :param predictions: np.ndarray or np.ma.MaskedArray
+    :param targets: np.ndarray or np.ma.MaskedArray, of a shape which broadcasts against the predictions array
+    :return: float
+    """
+
+    if np.ma.isMaskedArray(predictions) or np.ma.isMaskedArray(targets):
+
+        # keep only the elements which are unmasked in both arrays
+        valid = ~(np.ma.getmaskarray(predictions) | np.ma.getmaskarray(targets))
+        predictions, targets, valid = np.broadcast_arrays(np.ma.getdata(predictions), np.ma.getdata(targets), valid)
+        predictions = predictions[valid]
+        targets = targets[valid]
+
+    else:
+
+        predictions, targets = np.broadcast_arrays(predictions, targets)
+
+    # the compiled function only sees plain, contiguous 1-D float arrays
+    return _rmse(np.ascontiguousarray(predictions, dtype=np.float64).ravel(),
+                 np.ascontiguousarray(targets, dtype=np.float64).ravel())
+
+#-----------------------------------------------------------------------------------------------------------------------
+@numba.jit(nopython=True, fastmath={'reassoc', 'contract'})
+def _rmse(predictions, targets):
+    """
+    Root mean square error of two 1-D arrays of the same size, computed in a single pass over both arrays 
+    without allocating an intermediate array of squared differences.
+
+    :param predictions: 1-D np.ndarray of floats
+    :param targets: 1-D np.ndarray of floats, of the same size as the predictions array
+    :return: float
     """
-    return np.sqrt(((predictions - targets) ** 2).mean())
+
+    size = predictions.size
+    if size == 0:
+        return np.nan
+
+    # accumulate the sum of squared differences
+    sum_squares = 0.0
+    for i in range(size):
+        difference = predictions[i] - targets[i]
+        sum_squares += difference * difference
+
+    return np.sqrt(sum_squares / size)
 
 #-----------------------------------------------------------------------------------------------------------------------
 def compute_days(initial_year,
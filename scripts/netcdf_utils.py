@@ -3,7 +3,6 @@ import logging
 import netCDF4
 import numpy as np
 import os
-import random
 
 from climate_indices import utils
 
@@ -352,47 +351,69 @@ def add_variable_climdivs_divstime(file_path,
                                of the existing NetCDF being added to (as specified by the time coordinate variable).
     '''
     
+    # make sure we've been given some data to add
+    if not divisions_to_arrays:
+        
+        message = 'No division data provided for the variable \'{0}\''.format(variable_name)
+        _logger.error(message)
+        raise ValueError(message)
+        
     # get the NetCDF datatype applicable to the data array we'll store in the variable
-    random_array = random.choice(list(divisions_to_arrays.values()))
-    netcdf_data_type = find_netcdf_datatype(random_array[0])
+    # (all of the arrays are assumed to share the same data type, so we just look at the first)
+    first_array = next(iter(divisions_to_arrays.values()))
+    netcdf_data_type = find_netcdf_datatype(first_array[0])
     
     # open the output file in append mode for writing, set its dimensions and coordinate variables
     with netCDF4.Dataset(file_path, 'a') as dataset:
 
         # make sure that the variable name isn't already in use
-        if variable_name in dataset.variables.keys():
+        if variable_name in dataset.variables:
             
             message = 'Variable name \'{0}\' is already being used within the NetCDF file \'{1}\''.format(variable_name, file_path)
             _logger.error(message)
             raise ValueError(message)
             
-        # create the variable, set the attributes
+        # get the total number of time steps
+        times_size = dataset.variables['time'].size
+        
+        # create the variable, set the attributes, using one chunk per division to match
+        # the (division, time) access pattern of per-division time series reads/writes
         variable = dataset.createVariable(variable_name, 
                                           netcdf_data_type, 
                                           ('division', 'time',), 
-                                          fill_value=np.NaN)
+                                          fill_value=np.NaN,
+                                          chunksizes=(1, times_size),
+                                          zlib=True,
+                                          complevel=4,
+                                          shuffle=True)
         variable.setncatts(variable_attributes)
     
-        # get the total number of time steps
-        times_size = dataset.variables['time'][:].size
-        
+        # allocate a (division, time) array of fill values which we'll populate and then write in a single shot,
+        # using the variable's data type so that the write doesn't need to make a converted copy of the array
+        division_ids = list(dataset.variables['division'][:])
+        values = np.full((len(division_ids), times_size), np.NaN, dtype=netcdf_data_type)
+
         # loop over each existing division and add the corresponding data array, if one was provided
-        for division_index, division_id in enumerate(list(dataset.variables['division'][:])):
-            
+        for division_index, division_id in enumerate(division_ids):
+
             # make sure we have a data array of monthly values for this division
-            if division_id in divisions_to_arrays.keys():
+            if division_id in divisions_to_arrays:
 
-                # make sure the array has the expected number of time steps 
+                # make sure the array has the expected number of time steps
                 data_array = divisions_to_arrays[division_id]
                 if data_array.size == times_size:
-                
-                    # assign the array into the current division's slot in the variable
-                    variable[division_index, :] = np.reshape(data_array, (1, times_size))
+
+                    # copy the array into the current division's row, with NaNs in place of any masked values,
+                    # flattening arrays such as (years, 12) into the time series they represent
+                    values[division_index, :] = np.ma.filled(data_array, np.NaN).ravel()
 
                 else:
 
-                    _logger.info('Unexpected size of data array for division ID {0} -- '.format(division_id) + 
+                    _logger.info('Unexpected size of data array for division ID {0} -- '.format(division_id) +
                                 'expected {0} time steps but the array contains {1}'.format(times_size, data_array.size))
+
+        # write the values for all divisions into the variable at once
+        variable[:] = values
             
 #-----------------------------------------------------------------------------------------------------------------------
 def add_variable_climdivs_divs(file_path,
@@ -411,15 +432,23 @@ def add_variable_climdivs_divs(file_path,
     :param divisions_to_values: a dictionary with division IDs as keys and corresponding scalars as values.
     '''
 
+    # make sure we've been given some data to add
+    if not divisions_to_values:
+        
+        message = 'No division data provided for the variable \'{0}\''.format(variable_name)
+        _logger.error(message)
+        raise ValueError(message)
+        
     # get the NetCDF datatype applicable to the data array we'll store in the variable
-    random_value = random.choice(list(divisions_to_values.values()))
-    netcdf_data_type = find_netcdf_datatype(random_value)
+    # (all of the values are assumed to share the same data type, so we just look at the first)
+    first_value = next(iter(divisions_to_values.values()))
+    netcdf_data_type = find_netcdf_datatype(first_value)
     
     # open the output file in append mode for writing, set its dimensions and coordinate variables
     with netCDF4.Dataset(file_path, 'a') as dataset:
 
         # make sure that the variable name isn't already in use
-        if variable_name in dataset.variables.keys():
+        if variable_name in dataset.variables:
             
             message = 'Variable name \'{0}\' is already being used within the NetCDF file \'{1}\''.format(variable_name, file_path)
             _logger.error(message)
@@ -432,15 +461,14 @@ def add_variable_climdivs_divs(file_path,
                                           fill_value=np.NaN)
         variable.setncatts(variable_attributes)
     
-        # loop over each existing division, add the corresponding data array, if one was provided
-#         input_divisions = list(divisions_to_values.keys())
-        for division_index, division_id in enumerate(list(dataset.variables['division'][:])):
-            
-            # make sure we have a value for this division
-            if division_id in divisions_to_values.keys():
-                
-                # assign the value into the current division's slot in the variable
-                variable[division_index] = divisions_to_values[division_id]
+        # gather the value for each existing division into a single array, leaving the fill value in place
+        # for any division for which no value was provided, and with NaNs in place of any masked values
+        division_ids = dataset.variables['division'][:]
+        values = np.array([np.ma.filled(divisions_to_values.get(division_id, np.NaN), np.NaN) 
+                           for division_id in division_ids])
+
+        # write the values for all divisions in a single assignment rather than one division at a time
+        variable[:] = values
             
 #-----------------------------------------------------------------------------------------------------------------------
 def initialize_variable_climdivs(netcdf,                   # pragma: no cover
@@ -5,7 +5,6 @@ import multiprocessing
 import netCDF4
 import netcdf_utils
 import numpy as np
-import scipy.constants
 
 from climate_indices import indices
 
@@ -20,6 +19,58 @@ logger = logging.getLogger(__name__)
 # static constants
 _VALID_MIN = -10.0
 _VALID_MAX = 10.0
+_CONUS_MAX_DIVISION_ID = 4811
+_POSSIBLE_FAHRENHEIT_UNITS = ['degree_Fahrenheit', 'degrees Fahrenheit', 'degrees F', 'fahrenheit', 'Fahrenheit', 'F']
+_POSSIBLE_CELSIUS_UNITS = ['degree_Celsius', 'degrees Celsius', 'degrees C', 'celsius', 'Celsius', 'C']
+_POSSIBLE_MM_UNITS = ['millimeters', 'millimeter', 'mm']
+_MM_TO_INCHES_FACTOR = 0.0393701
+
+#-----------------------------------------------------------------------------------------------------------------------
+# variable attributes for the indices which are not month scaled, keyed by index/variable name
+_UNSCALED_ATTRIBUTES = {'pet': {'standard_name': 'pet',
+                                'long_name': 'Potential Evapotranspiration (PET), from Thornthwaite\'s equation',
+                                'valid_min': 0.0,
+                                'valid_max': 2000.0,
+                                'units': 'millimeter'},
+                        'pdsi': {'standard_name': 'pdsi',
+                                 'long_name': 'Palmer Drought Severity Index (PDSI)',
+                                 'valid_min': _VALID_MIN,
+                                 'valid_max': _VALID_MAX},
+                        'scpdsi': {'standard_name': 'scpdsi',
+                                   'long_name': 'Self-calibrated Palmer Drought Severity Index (PDSI)',
+                                   'valid_min': _VALID_MIN,
+                                   'valid_max': _VALID_MAX},
+                        'phdi': {'standard_name': 'phdi',
+                                 'long_name': 'Palmer Hydrological Drought Index (PHDI)',
+                                 'valid_min': _VALID_MIN,
+                                 'valid_max': _VALID_MAX},
+                        'pmdi': {'standard_name': 'pmdi',
+                                 'long_name': 'Palmer Modified Drought Index (PMDI)',
+                                 'valid_min': _VALID_MIN,
+                                 'valid_max': _VALID_MAX},
+                        'zindex': {'standard_name': 'zindex',
+                                   'long_name': 'Palmer Z-Index',
+                                   'valid_min': _VALID_MIN,
+                                   'valid_max': _VALID_MAX}}
+
+# variable attributes for the month scaled indices, keyed by index name, with the long name
+# as a template into which the number of months is inserted and the standard name added per scale
+_SCALED_ATTRIBUTES = {'pnp': {'long_name': 'Percent average precipitation, {}-month scale',
+                              'valid_min': 0,
+                              'valid_max': 10.0,
+                              'units': 'percent of average'},
+                      'spi_gamma': {'long_name': 'SPI (Gamma), {}-month scale',
+                                    'valid_min': -3.09,
+                                    'valid_max': 3.09},
+                      'spi_pearson': {'long_name': 'SPI (Pearson), {}-month scale',
+                                      'valid_min': -3.09,
+                                      'valid_max': 3.09},
+                      'spei_gamma': {'long_name': 'SPEI (Gamma), {}-month scale',
+                                     'valid_min': -3.09,
+                                     'valid_max': 3.09},
+                      'spei_pearson': {'long_name': 'SPEI (Pearson), {}-month scale',
+                                       'valid_min': -3.09,
+                                       'valid_max': 3.09}}
 
 #-----------------------------------------------------------------------------------------------------------------------
 # multiprocessing lock we'll use to synchronize I/O writes to NetCDF files, one per each output file
@@ -85,12 +136,15 @@ class DivisionsProcessor(object):
       
             data_dtype = netcdf_utils.find_netcdf_datatype(fill_value)
          
+            # use a single chunk per full time series, since we read and write one division's time series at a time
+            chunk_sizes = tuple(len(new_dataset.dimensions[name]) if name == 'time' else 1 for name in dimensions)
+
             # create a variable for each unscaled index
             unscaled_indices = ['pet', 'pdsi', 'phdi', 'pmdi', 'zindex', 'scpdsi']
             for variable_name in unscaled_indices:
                 
                 # only add the variable if it's not already present
-                if variable_name in new_dataset.variables.keys():
+                if variable_name in new_dataset.variables:
                     continue
                 
                 # get the attributes based on the name
@@ -101,6 +155,7 @@ class DivisionsProcessor(object):
                                                            data_dtype,
                                                            dimensions,
                                                            fill_value=fill_value, 
+                                                           chunksizes=chunk_sizes,
                                                            zlib=False)
                 data_variable.setncatts(variable_attributes)
      
@@ -112,7 +167,7 @@ class DivisionsProcessor(object):
                     variable_name = scaled_index + '_{}'.format(str(months).zfill(2))
                      
                     # only add the variable if it's not already present
-                    if variable_name in new_dataset.variables.keys():
+                    if variable_name in new_dataset.variables:
                         continue
                 
                     # get the attributes based on the name and number of scale months
@@ -123,205 +178,171 @@ class DivisionsProcessor(object):
                                                                data_dtype,
                                                                dimensions,
                                                                fill_value=fill_value, 
+                                                               chunksizes=chunk_sizes,
                                                                zlib=False)
                     data_variable.setncatts(variable_attributes)
      
     #-----------------------------------------------------------------------------------------------------------------------
-    def _compute_and_write_division(self, div_index):
+    def _compute_and_write_division(self, division_inputs):
         """
         Computes indices for a single division, writing the output into NetCDF.
         
-        :param div_index: 
+        The division's inputs are read by the parent process and passed in, so the NetCDF file is only opened 
+        (in append mode, while holding the lock) once the division's index values have all been computed, 
+        to write them all at once.
+        
+        :param division_inputs: tuple of the division's index, division ID, temperature time series and units, 
+                                precipitation time series and units, latitude, and available water capacity
         """
 
-        # only process specified divisions
-        if self.divisions is not None and div_index not in self.divisions:
-            return
-        
-        # open the NetCDF files 
-        with netCDF4.Dataset(self.divisions_file, 'a') as divisions_dataset:
-            
-            climdiv_id = divisions_dataset['division'][div_index]
-            
-            # only process divisions within CONUS, 101 - 4811
-            if climdiv_id > 4811:
-                return
-            
-            logger.info('Processing indices for division %s', climdiv_id)
+        div_index, climdiv_id, temperature, temperature_units, precip_time_series, precip_units, latitude, awc = \
+            division_inputs
         
-            # read the division of input temperature values 
-            temperature = divisions_dataset[self.var_name_temperature][div_index, :]    # assuming (divisions, time) orientation
-            
-            # initialize the latitude outside of the valid range, in order to use this within a conditional below to verify a valid latitude
-            latitude = -100.0  
-    
-            # latitudes are only available for certain divisions, make sure we have one for this division index
-            if div_index < divisions_dataset['lat'][:].size:
-                
-                # get the actual latitude value (assumed to be in degrees north) for the latitude slice specified by the index
-                latitude = divisions_dataset['lat'][div_index]
+        logger.info('Processing indices for division %s', climdiv_id)
     
-            # only proceed if the latitude value is within valid range            
-            if not np.isnan(latitude) and (latitude < 90.0) and (latitude > -90.0):
-                
-                # convert temperatures from Fahrenheit to Celsius, if necessary
-                temperature_units = divisions_dataset[self.var_name_temperature].units
-                if temperature_units in ['degree_Fahrenheit', 'degrees Fahrenheit', 'degrees F', 'fahrenheit', 'Fahrenheit', 'F']:
-                    
-                    # TODO make sure this application of the ufunc is any faster  pylint: disable=fixme
-                    temperature = scipy.constants.convert_temperature(temperature, 'F', 'C')
-    
-                elif temperature_units not in ['degree_Celsius', 'degrees Celsius', 'degrees C', 'celsius', 'Celsius', 'C']:
-                    
-                    raise ValueError('Unsupported temperature units: \'{0}\''.format(temperature_units))
+        # computed index values to be written to NetCDF, keyed by variable name
+        index_values = {}
         
-                # use the numpy.apply_along_axis() function for computing indices such as PET that take a single time series
-                # array as input (i.e. each division's time series is the initial 1-D array argument to the function we'll apply)
-                
-                logger.info('\tComputing PET for division %s', climdiv_id)
-    
-                logger.info('\t\tCalculating PET using Thornthwaite method')
-
-                # compute PET across all longitudes of the latitude slice
-                # Thornthwaite PE
-                pet_time_series = indices.pet(temperature, 
-                                              latitude_degrees=latitude, 
-                                              data_start_year=self.data_start_year)
-                            
-                # the above returns PET in millimeters, note this for further consideration
-                pet_units = 'millimeter'
-                
-                # write the PET values to NetCDF        
-                lock.acquire()
-                divisions_dataset['pet'][div_index, :] = np.reshape(pet_time_series, (1, pet_time_series.size))
-                divisions_dataset.sync()
-                lock.release()
-    
-            else:
-                
-                pet_time_series = np.full(temperature.shape, np.NaN)
-                pet_units = None
-    
-            # read the division's input precipitation and available water capacity values
-            precip_time_series = divisions_dataset[self.var_name_precip][div_index, :]   # assuming (divisions, time) orientation
+        # only proceed if the latitude value is within valid range            
+        if not np.isnan(latitude) and (latitude < 90.0) and (latitude > -90.0):
             
-            if div_index < divisions_dataset[self.var_name_soil][:].size:
-                awc = divisions_dataset[self.var_name_soil][div_index]               # assuming (divisions) orientation
-                awc += 1   # AWC values need to include top inch, values from the soil file do not, so we add top inch here
-            else:
-                awc = np.NaN
-                
-            # allocate arrays to contain a latitude slice of Palmer values
-            time_size = divisions_dataset['time'].size
-            division_shape = (time_size)
-            pdsi = np.full(division_shape, np.NaN)
-            phdi = np.full(division_shape, np.NaN)
-            pmdi = np.full(division_shape, np.NaN)
-            scpdsi = np.full(division_shape, np.NaN)
-            zindex = np.full(division_shape, np.NaN)
-        
-            # compute SPI and SPEI for the current division only if we have valid inputs
-            if not np.isnan(precip_time_series).all():
+            # convert temperatures from Fahrenheit to Celsius, if necessary
+            if temperature_units in _POSSIBLE_FAHRENHEIT_UNITS:
                 
-                # put precipitation into inches if not already
-                mm_to_inches_multiplier = 0.0393701
-                possible_mm_units = ['millimeters', 'millimeter', 'mm']
-                if divisions_dataset[self.var_name_precip].units in possible_mm_units:
-                    precip_time_series = precip_time_series * mm_to_inches_multiplier
-        
-                if not np.isnan(pet_time_series).all():
+                temperature = _f2c(temperature)
+
+            elif temperature_units not in _POSSIBLE_CELSIUS_UNITS:
                 
-                    # compute Palmer indices if we have valid inputs
-                    if not np.isnan(awc):
-                            
-                        # if PET is in mm, convert to inches
-                        if pet_units in possible_mm_units:
-                            pet_time_series = pet_time_series * mm_to_inches_multiplier
-        
-                        # PET is in mm, convert to inches since the Palmer uses imperial units
-                        pet_time_series = pet_time_series * mm_to_inches_multiplier
-        
-                        logger.info('\tComputing PDSI for division %s', climdiv_id)
+                raise ValueError('Unsupported temperature units: \'{0}\''.format(temperature_units))
     
-                        # compute Palmer indices
-                        palmer_values = indices.scpdsi(precip_time_series,
-                                                       pet_time_series,
-                                                       awc,
-                                                       self.data_start_year,
-                                                       self.calibration_start_year,
-                                                       self.calibration_end_year)
+            # use the numpy.apply_along_axis() function for computing indices such as PET that take a single time series
+            # array as input (i.e. each division's time series is the initial 1-D array argument to the function we'll apply)
             
-                        scpdsi = palmer_values[0]
-                        pdsi = palmer_values[1]
-                        phdi = palmer_values[2]
-                        pmdi = palmer_values[3]
-                        zindex = palmer_values[4]
-        
-                        # write the PDSI values to NetCDF
-                        lock.acquire()
-                        divisions_dataset['pdsi'][div_index, :] = np.reshape(pdsi, (1, pdsi.size))
-                        divisions_dataset['phdi'][div_index, :] = np.reshape(phdi, (1, phdi.size))
-                        divisions_dataset['pmdi'][div_index, :] = np.reshape(pmdi, (1, pmdi.size))
-                        divisions_dataset['scpdsi'][div_index, :] = np.reshape(pdsi, (1, scpdsi.size))
-                        divisions_dataset['zindex'][div_index, :] = np.reshape(zindex, (1, zindex.size))
-                        divisions_dataset.sync()
-                        lock.release()
-        
-                    # process the SPI and SPEI at the specified month scales
-                    for months in self.scale_months:
+            logger.info('\tComputing PET for division %s', climdiv_id)
+
+            logger.info('\t\tCalculating PET using Thornthwaite method')
+
+            # compute PET across all longitudes of the latitude slice
+            # Thornthwaite PE
+            pet_time_series = indices.pet(temperature, 
+                                          latitude_degrees=latitude, 
+                                          data_start_year=self.data_start_year)
                         
-                        logger.info('\tComputing SPI/SPEI/PNP at %s-month scale for division %s', months, climdiv_id)
+            # the above returns PET in millimeters, note this for further consideration
+            pet_units = 'millimeter'
+            
+            # keep the PET values for writing to NetCDF
+            index_values['pet'] = pet_time_series
+
+        else:
+            
+            pet_time_series = np.full(temperature.shape, np.NaN)
+            pet_units = None
+
+        # compute SPI and SPEI for the current division only if we have valid inputs
+        if not np.isnan(precip_time_series).all():
+            
+            # put precipitation into inches if not already, in place since the array is only used for this division
+            if precip_units in _POSSIBLE_MM_UNITS:
+                precip_time_series *= _MM_TO_INCHES_FACTOR
     
-                        #TODO ensure that the precipitation and PET values are using the same units  pylint: disable=fixme
+            if not np.isnan(pet_time_series).all():
+            
+                # compute Palmer indices if we have valid inputs
+                if not np.isnan(awc):
                         
-                        # compute SPEI/Gamma
-                        spei_gamma = indices.spei_gamma(months,
-                                                        precip_time_series,
-                                                        pet_mm=pet_time_series)
+                    # if PET is in mm, convert to inches
+                    if pet_units in _POSSIBLE_MM_UNITS:
+                        pet_time_series = pet_time_series * _MM_TO_INCHES_FACTOR
     
-                        # compute SPEI/Pearson
-                        spei_pearson = indices.spei_pearson(months,
-                                                            self.data_start_year,
-                                                            precip_time_series,
-                                                            pet_mm=pet_time_series,
-                                                            calibration_year_initial=self.calibration_start_year,
-                                                            calibration_year_final=self.calibration_end_year)
-                         
-                        # compute SPI/Gamma
-                        spi_gamma = indices.spi_gamma(precip_time_series, 
-                                                      months)
-                 
-                        # compute SPI/Pearson
-                        spi_pearson = indices.spi_pearson(precip_time_series, 
-                                                          months,
-                                                          self.data_start_year,
-                                                          self.calibration_start_year, 
-                                                          self.calibration_end_year)        
-            
-                        # compute PNP
-                        pnp = indices.percentage_of_normal(precip_time_series, 
-                                                           months,
-                                                           self.data_start_year,
-                                                           self.calibration_start_year, 
-                                                           self.calibration_end_year)        
+                    # PET is in mm, convert to inches since the Palmer uses imperial units
+                    pet_time_series = pet_time_series * _MM_TO_INCHES_FACTOR
+    
+                    logger.info('\tComputing PDSI for division %s', climdiv_id)
+
+                    # compute Palmer indices
+                    palmer_values = indices.scpdsi(precip_time_series,
+                                                   pet_time_series,
+                                                   awc,
+                                                   self.data_start_year,
+                                                   self.calibration_start_year,
+                                                   self.calibration_end_year)
         
-                        # create variable names which should correspond to the appropriate scaled index output variables
-                        scaled_name_suffix = str(months).zfill(2)
-                        spei_gamma_variable_name = 'spei_gamma_' + scaled_name_suffix
-                        spei_pearson_variable_name = 'spei_pearson_' + scaled_name_suffix
-                        spi_gamma_variable_name = 'spi_gamma_' + scaled_name_suffix
-                        spi_pearson_variable_name = 'spi_pearson_' + scaled_name_suffix
-                        pnp_variable_name = 'pnp_' + scaled_name_suffix
+                    # keep the Palmer values for writing to NetCDF
+                    index_values['scpdsi'] = palmer_values[0]
+                    index_values['pdsi'] = palmer_values[1]
+                    index_values['phdi'] = palmer_values[2]
+                    index_values['pmdi'] = palmer_values[3]
+                    index_values['zindex'] = palmer_values[4]
+    
+                # process the SPI and SPEI at the specified month scales
+                for months in self.scale_months:
+                    
+                    logger.info('\tComputing SPI/SPEI/PNP at %s-month scale for division %s', months, climdiv_id)
+
+                    #TODO ensure that the precipitation and PET values are using the same units  pylint: disable=fixme
+                    
+                    # compute SPEI/Gamma
+                    spei_gamma = indices.spei(months,
+                                              indices.Distribution.gamma,
+                                              'monthly',
+                                              self.data_start_year,
+                                              self.calibration_start_year,
+                                              self.calibration_end_year,
+                                              precip_time_series,
+                                              pet_mm=pet_time_series)
+
+                    # compute SPEI/Pearson
+                    spei_pearson = indices.spei(months,
+                                                indices.Distribution.pearson_type3,
+                                                'monthly',
+                                                self.data_start_year,
+                                                self.calibration_start_year,
+                                                self.calibration_end_year,
+                                                precip_time_series,
+                                                pet_mm=pet_time_series)
+                     
+                    # compute SPI/Gamma
+                    spi_gamma = indices.spi(precip_time_series, 
+                                            months,
+                                            indices.Distribution.gamma,
+                                            self.data_start_year,
+                                            self.calibration_start_year, 
+                                            self.calibration_end_year,
+                                            'monthly')
+             
+                    # compute SPI/Pearson
+                    spi_pearson = indices.spi(precip_time_series, 
+                                              months,
+                                              indices.Distribution.pearson_type3,
+                                              self.data_start_year,
+                                              self.calibration_start_year, 
+                                              self.calibration_end_year,
+                                              'monthly')        
         
-                        # write the SPI, SPEI, and PNP values to NetCDF        
-                        lock.acquire()
-                        divisions_dataset[spei_gamma_variable_name][div_index, :] =   np.reshape(spei_gamma, (1, spei_gamma.size))
-                        divisions_dataset[spei_pearson_variable_name][div_index, :] = np.reshape(spei_pearson, (1, spei_pearson.size))
-                        divisions_dataset[spi_gamma_variable_name][div_index, :] =    np.reshape(spi_gamma, (1, spi_gamma.size))
-                        divisions_dataset[spi_pearson_variable_name][div_index, :] =  np.reshape(spi_pearson, (1, spi_pearson.size))
-                        divisions_dataset[pnp_variable_name][div_index, :] =          np.reshape(pnp, (1, pnp.size))
-                        divisions_dataset.sync()
-                        lock.release()
+                    # compute PNP
+                    pnp = indices.percentage_of_normal(precip_time_series, 
+                                                       months,
+                                                       self.data_start_year,
+                                                       self.calibration_start_year, 
+                                                       self.calibration_end_year,
+                                                       'monthly')        
+    
+                    # keep the SPI, SPEI, and PNP values for writing to NetCDF, using variable names 
+                    # which should correspond to the appropriate scaled index output variables
+                    scaled_name_suffix = str(months).zfill(2)
+                    index_values['spei_gamma_' + scaled_name_suffix] = spei_gamma
+                    index_values['spei_pearson_' + scaled_name_suffix] = spei_pearson
+                    index_values['spi_gamma_' + scaled_name_suffix] = spi_gamma
+                    index_values['spi_pearson_' + scaled_name_suffix] = spi_pearson
+                    index_values['pnp_' + scaled_name_suffix] = pnp
+
+        # write all of the division's computed index values to NetCDF
+        if index_values:
+            
+            with lock, netCDF4.Dataset(self.divisions_file, 'a') as divisions_dataset:
+                for variable_name, values in index_values.items():
+                    divisions_dataset[variable_name][div_index, :] = values
 
     #-------------------------------------------------------------------------------------------------------------------
     def run(self):
@@ -333,19 +354,62 @@ class DivisionsProcessor(object):
             time_variable = input_dataset.variables['time']
             self.data_start_year = netCDF4.num2date(time_variable[0], time_variable.units).year
  
-            # get the number of divisions in the input dataset(s)
-            divisions_count = input_dataset.variables['division'].size
+            # read all of the divisions' inputs up front, since these are small (division, time) arrays, so that
+            # worker processes don't need to read from the file (and wait on the lock to do so) at all, with NaNs 
+            # in place of masked/missing values so that subsequent arithmetic avoids the overhead of masked arrays
+            division_ids = input_dataset.variables['division'][:]
+            temperature_variable = input_dataset.variables[self.var_name_temperature]
+            temperatures = np.ma.filled(temperature_variable[:], np.NaN)    # assuming (divisions, time) orientation
+            temperature_units = temperature_variable.units
+            precip_variable = input_dataset.variables[self.var_name_precip]
+            precips = np.ma.filled(precip_variable[:], np.NaN)              # assuming (divisions, time) orientation
+            precip_units = precip_variable.units
+            latitudes = np.ma.filled(input_dataset.variables['lat'][:], np.NaN)
+            awcs = np.ma.filled(input_dataset.variables[self.var_name_soil][:], np.NaN)   # assuming (divisions) orientation
         
+        # gather the inputs of each division to be processed, only for the specified divisions within CONUS (101 - 4811)
+        divisions_inputs = []
+        for div_index, climdiv_id in enumerate(division_ids):
+            
+            if (self.divisions is not None and div_index not in self.divisions) or (climdiv_id > _CONUS_MAX_DIVISION_ID):
+                continue
+            
+            # latitudes are only available for certain divisions, for those without one we use a latitude 
+            # outside of the valid range, so that the division's PET won't be computed
+            if div_index < latitudes.size:
+                latitude = latitudes[div_index]    # assumed to be in degrees north
+            else:
+                latitude = -100.0
+                
+            if div_index < awcs.size:
+                awc = awcs[div_index] + 1   # AWC values need to include top inch, values from the soil file do not, so we add top inch here
+            else:
+                awc = np.NaN
+
+            divisions_inputs.append((div_index, 
+                                     climdiv_id, 
+                                     temperatures[div_index, :], 
+                                     temperature_units,
+                                     precips[div_index, :], 
+                                     precip_units,
+                                     latitude, 
+                                     awc))
+            
         #--------------------------------------------------------------------------------------------------------------
         # Create PET and Palmer index NetCDF files, computed from input temperature, precipitation, and soil constant.
         # Compute SPI, SPEI, and PNP at all specified month scales.
         #--------------------------------------------------------------------------------------------------------------
 
-        # create a process Pool for worker processes to compute indices for each division
-        pool = multiprocessing.Pool(processes=multiprocessing.cpu_count())   # use single process here instead when debugging
-          
-        # map the divisions indices as an arguments iterable to the compute function
-        result = pool.map_async(self._compute_and_write_division, range(divisions_count))
+        # create a process Pool for worker processes to compute indices for each division,
+        # with no more worker processes than there are divisions to compute (but at least one)
+        number_of_workers = max(1, min(multiprocessing.cpu_count(), len(divisions_inputs)))   # use single process here instead when debugging
+
+        pool = multiprocessing.Pool(processes=number_of_workers)
+
+        # map each division's inputs as an arguments iterable to the compute function, one division per task
+        # since the cost per division varies widely and batching several divisions per task
+        # would leave workers idle while others finish long batches
+        result = pool.map_async(self._compute_and_write_division, divisions_inputs, chunksize=1)
                   
         # get the exception(s) thrown, if any
         result.get()
@@ -414,104 +478,37 @@ def _variable_attributes(index_name,
     :param months: for month-scaled indices a number of months to use as scale
     :return: dictionary of attribute names to values 
     """
-    if index_name == 'pet':
-          
-        variable_name = 'pet'
-        variable_attributes = {'standard_name': 'pet',
-                               'long_name': 'Potential Evapotranspiration (PET), from Thornthwaite\'s equation',
-                               'valid_min': 0.0,
-                               'valid_max': 2000.0,
-                               'units': 'millimeter'}
-      
-    elif index_name == 'pdsi':
-          
-        variable_name = 'pdsi'
-        variable_attributes = {'standard_name': 'pdsi',
-                               'long_name': 'Palmer Drought Severity Index (PDSI)',
-                               'valid_min': -10.0,
-                               'valid_max': 10.0}
-      
-    elif index_name == 'scpdsi':
-          
-        variable_name = 'scpdsi'
-        variable_attributes = {'standard_name': 'scpdsi',
-                               'long_name': 'Self-calibrated Palmer Drought Severity Index (PDSI)',
-                               'valid_min': -10.0,
-                               'valid_max': 10.0}
-      
-    elif index_name == 'phdi':
-          
-        variable_name = 'phdi'
-        variable_attributes = {'standard_name': 'phdi',
-                               'long_name': 'Palmer Hydrological Drought Index (PHDI)',
-                               'valid_min': -10.0,
-                               'valid_max': 10.0}
-      
-    elif index_name == 'pmdi':
-          
-        variable_name = 'pmdi'
-        variable_attributes = {'standard_name': 'pmdi',
-                               'long_name': 'Palmer Modified Drought Index (PMDI)',
-                               'valid_min': -10.0,
-                               'valid_max': 10.0}
-      
-    elif index_name == 'zindex':
-          
-        variable_name = 'zindex'
-        variable_attributes = {'standard_name': 'zindex',
-                               'long_name': 'Palmer Z-Index',
-                               'valid_min': -10.0,
-                               'valid_max': 10.0}
-
-    else:
-
-        # use the scale months in the variable name        
-        variable_name = index_name + '_{}'.format(str(months).zfill(2))
-    
-        if index_name == 'pnp':
+    if index_name in _UNSCALED_ATTRIBUTES:
         
-            variable_attributes = {'standard_name': variable_name,
-                                   'long_name': 'Percent average precipitation, {}-month scale'.format(months),
-                                   'valid_min': 0,
-                                   'valid_max': 10.0,
-                                   'units': 'percent of average'}
+        # return a copy so callers can't modify the shared attributes
+        variable_attributes = dict(_UNSCALED_ATTRIBUTES[index_name])
 
-        elif index_name == 'spi_gamma':
-        
-            variable_attributes = {'standard_name': variable_name,
-                                   'long_name': 'SPI (Gamma), {}-month scale'.format(months),
-                                   'valid_min': -3.09,
-                                   'valid_max': 3.09}
-        
-        elif index_name == 'spi_pearson':
-        
-            variable_attributes = {'standard_name': variable_name,
-                                   'long_name': 'SPI (Pearson), {}-month scale'.format(months),
-                                   'valid_min': -3.09,
-                                   'valid_max': 3.09}
-        
-        elif index_name == 'spei_gamma':
-        
-            variable_attributes = {'standard_name': variable_name,
-                                   'long_name': 'SPEI (Gamma), {}-month scale'.format(months),
-                                   'valid_min': -3.09,
-                                   'valid_max': 3.09}
-        
-        elif index_name == 'spei_pearson':
-        
-            variable_attributes = {'standard_name': variable_name,
-                                   'long_name': 'SPEI (Pearson), {}-month scale'.format(months),
-                                   'valid_min': -3.09,
-                                   'valid_max': 3.09}
+    elif index_name in _SCALED_ATTRIBUTES:
 
-        else:
+        # use the scale months in the variable name and long name
+        variable_attributes = dict(_SCALED_ATTRIBUTES[index_name])
+        variable_attributes['standard_name'] = index_name + '_{}'.format(str(months).zfill(2))
+        variable_attributes['long_name'] = variable_attributes['long_name'].format(months)
+
+    else:
         
-            message = '{0} is an unsupported index type'.format(index_name)
-            logger.error(message)
-            raise ValueError(message)
+        message = '{0} is an unsupported index type'.format(index_name)
+        logger.error(message)
+        raise ValueError(message)
 
     return variable_attributes
     
+#-----------------------------------------------------------------------------------------------------------------------
+def _f2c(temperature_fahrenheit):
+    """
+    Converts temperature values from degrees Fahrenheit to degrees Celsius.
+    
+    :param temperature_fahrenheit: scalar or array of temperature values, in degrees Fahrenheit
+    :return: temperature values in degrees Celsius, of the same shape and floating point type as the input
+    """
+    
+    return (temperature_fahrenheit - 32.0) * (5.0 / 9.0)
+    
 #-----------------------------------------------------------------------------------------------------------------------
 def process_divisions(divisions_file,
                       precip_var_name,
@@ -591,11 +588,6 @@ if __name__ == '__main__':
                             type=int,
                             choices=range(1870, start_datetime.year + 1),
                             required=True)
-        parser.add_argument("--orig_pe", 
-                            help="Use the original NCDC method for calculating potential evapotranspiration (PE) used in original Fortran", 
-                            type=bool,
-                            default=False,
-                            required=False)
         parser.add_argument("--divisions",
                             help="Divisions for which the PNP, SPI, and SPEI values are to be computed, useful for specifying a short list of divisions",
                             type=int,
@@ -612,7 +604,6 @@ if __name__ == '__main__':
                           args.month_scales,
                           args.calibration_start_year,
                           args.calibration_end_year,
-                          args.orig_pe,
                           args.divisions)
         
         # report on the elapsed time
@@ -1,5 +1,8 @@
 import logging
+import netCDF4
 import numpy as np
+import os
+import tempfile
 import unittest
 
 from scripts import netcdf_utils
@@ -40,7 +43,89 @@ class NetcdfUtilsTestCase(unittest.TestCase):
             netcdf_utils.find_netcdf_datatype(data_object={'abc': 123})
             netcdf_utils.find_netcdf_datatype("hokey pokey")
             netcdf_utils.find_netcdf_datatype(['this is a list of heterogeneous items', 14, {43: 56}])
-        
+
+    #----------------------------------------------------------------------------------------
+    def _create_climdivs_file(self, division_ids, times_size):
+        '''
+        Creates a minimal (division, time) NetCDF file in a temporary directory, returning the file's path
+        '''
+
+        file_path = os.path.join(tempfile.mkdtemp(), 'climdivs.nc')
+        self.addCleanup(os.remove, file_path)
+
+        with netCDF4.Dataset(file_path, 'w') as dataset:
+            dataset.createDimension('division', len(division_ids))
+            dataset.createDimension('time', times_size)
+            dataset.createVariable('division', 'i4', ('division',))[:] = division_ids
+            dataset.createVariable('time', 'i4', ('time',))[:] = np.arange(times_size)
+
+        return file_path
+
+    #----------------------------------------------------------------------------------------
+    def test_add_variable_climdivs_divstime(self):
+        '''
+        Test for the netcdf_utils.add_variable_climdivs_divstime() function
+        '''
+
+        times_size = 6
+        file_path = self._create_climdivs_file([101, 102, 103, 104], times_size)
+
+        # a masked array for the first division, an array of the wrong length for the second,
+        # no array at all for the third division, and a 2-D (years, months) array for the fourth
+        masked_array = np.ma.masked_array(np.arange(times_size, dtype=np.float64),
+                                          mask=[False, False, True, False, True, False])
+        divisions_to_arrays = {101: masked_array,
+                               102: np.ones((times_size + 1,)),
+                               104: np.arange(times_size, dtype=np.float64).reshape((2, times_size // 2))}
+        netcdf_utils.add_variable_climdivs_divstime(file_path, 'pdsi', {'long_name': 'test'}, divisions_to_arrays)
+
+        with netCDF4.Dataset(file_path) as dataset:
+            values = np.ma.filled(dataset.variables['pdsi'][:], np.NaN)
+
+        # masked values should come back as NaNs, the rows of the second and third divisions should be 
+        # all fill values, and the 2-D array should come back as the time series it represents
+        expected = np.full((4, times_size), np.NaN)
+        expected[0, :] = [0.0, 1.0, np.NaN, 3.0, np.NaN, 5.0]
+        expected[3, :] = np.arange(times_size)
+        np.testing.assert_equal(values, 
+                                expected, 
+                                'Failed to write the expected (division, time) values')
+
+    #----------------------------------------------------------------------------------------
+    def test_add_variable_climdivs_divs(self):
+        '''
+        Test for the netcdf_utils.add_variable_climdivs_divs() function
+        '''
+
+        file_path = self._create_climdivs_file([101, 102, 103], 6)
+
+        # a valid value for the first division, a masked value for the second, and no value for the third division
+        masked_values = np.ma.masked_array([1.5, 2.5], mask=[False, True])
+        divisions_to_values = {101: masked_values[0],
+                               102: masked_values[1]}
+        netcdf_utils.add_variable_climdivs_divs(file_path, 'awc', {'long_name': 'test'}, divisions_to_values)
+
+        with netCDF4.Dataset(file_path) as dataset:
+            values = np.ma.filled(dataset.variables['awc'][:], np.NaN)
+
+        # the masked and missing divisions should come back as NaNs
+        np.testing.assert_equal(values, 
+                                np.array([1.5, np.NaN, np.NaN]), 
+                                'Failed to write the expected (division) values')
+
+    #----------------------------------------------------------------------------------------
+    def test_add_variable_climdivs_empty(self):
+        '''
+        Test for the netcdf_utils.add_variable_climdivs_divstime() and add_variable_climdivs_divs()
+        functions when no division data is provided
+        '''
+
+        # an empty dictionary of division data should raise an error before the NetCDF file is opened
+        with self.assertRaises(ValueError):
+            netcdf_utils.add_variable_climdivs_divstime('no_such_file.nc', 'pdsi', {}, {})
+        with self.assertRaises(ValueError):
+            netcdf_utils.add_variable_climdivs_divs('no_such_file.nc', 'awc', {}, {})
+
 #--------------------------------------------------------------------------------------------
 if __name__ == '__main__':
     unittest.main()
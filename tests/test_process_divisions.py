@@ -0,0 +1,87 @@
+import logging
+import netCDF4
+import numpy as np
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# the processing scripts import their sibling modules directly, as they do when run from the scripts directory
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+import process_divisions
+
+#-----------------------------------------------------------------------------------------------------------------------
+# disable logging messages
+logging.disable(logging.CRITICAL)
+
+#-------------------------------------------------------------------------------------------------------------------------------------------
+class ProcessDivisionsTestCase(unittest.TestCase):
+    '''
+    Tests for `process_divisions.py`.
+    '''
+
+    #----------------------------------------------------------------------------------------
+    def test_compute_and_write_division(self):
+        '''
+        Smoke test for the process_divisions.DivisionsProcessor._compute_and_write_division() function, 
+        using a tiny synthetic divisions file, with the index computations themselves replaced by stand-ins 
+        returning constant values, so that we only test which values get written where
+        '''
+
+        times_size = 24
+        file_path = os.path.join(tempfile.mkdtemp(), 'climdivs.nc')
+        self.addCleanup(os.remove, file_path)
+        with netCDF4.Dataset(file_path, 'w') as dataset:
+            dataset.createDimension('division', 2)
+            dataset.createDimension('time', times_size)
+            dataset.createVariable('division', 'i4', ('division',))[:] = [101, 102]
+            time_variable = dataset.createVariable('time', 'i4', ('time',))
+            time_variable.units = 'days since 1895-01-01'
+            time_variable[:] = np.arange(times_size) * 30
+
+        processor = process_divisions.DivisionsProcessor(file_path, 'prcp', 'tavg', 'awc', [3], 1895, 1896)
+
+        # inputs for the second division, in Fahrenheit and millimeters
+        temperature = np.full((times_size,), 50.0)
+        precip = np.full((times_size,), 100.0)
+        division_inputs = (1, 102, temperature, 'degrees Fahrenheit', precip, 'mm', 40.0, 5.0)
+
+        # stand-ins for the index computations, returning a distinct constant (within the valid range) for each
+        # index, with the gamma fitted SPI/SPEI computed before the Pearson fitted SPI/SPEI
+        indices = process_divisions.indices
+        stand_in_values = np.full((times_size,), 1.0)
+        with mock.patch.object(indices, 'pet', return_value=stand_in_values * 2) as pet, \
+             mock.patch.object(indices, 'scpdsi', return_value=tuple(stand_in_values * i for i in range(3, 8))), \
+             mock.patch.object(indices, 'spei', side_effect=[stand_in_values * 0.25, stand_in_values * 0.5]), \
+             mock.patch.object(indices, 'spi', side_effect=[stand_in_values * 0.75, stand_in_values * 1.0]) as spi, \
+             mock.patch.object(indices, 'percentage_of_normal', return_value=stand_in_values * 1.25):
+            
+            processor._compute_and_write_division(division_inputs)
+
+        # the inputs should have been converted to Celsius and inches before the indices were computed
+        np.testing.assert_allclose(pet.call_args[0][0], 
+                                   np.full((times_size,), 10.0), 
+                                   err_msg='Temperatures not converted from Fahrenheit to Celsius')
+        np.testing.assert_allclose(spi.call_args[0][0], 
+                                   np.full((times_size,), 3.93701), 
+                                   err_msg='Precipitation not converted from millimeters to inches')
+
+        # each index should have been written into the second division's row only
+        expected_values = {'pet': 2, 'scpdsi': 3, 'pdsi': 4, 'phdi': 5, 'pmdi': 6, 'zindex': 7, 
+                           'spei_gamma_03': 0.25, 'spei_pearson_03': 0.5, 'spi_gamma_03': 0.75, 
+                           'spi_pearson_03': 1.0, 'pnp_03': 1.25}
+        with netCDF4.Dataset(file_path) as dataset:
+            for variable_name, value in expected_values.items():
+                
+                values = np.ma.filled(dataset.variables[variable_name][:], np.NaN)
+                np.testing.assert_equal(values[0], 
+                                        np.full((times_size,), np.NaN), 
+                                        'Unexpected values written for another division: {0}'.format(variable_name))
+                np.testing.assert_allclose(values[1], 
+                                           np.full((times_size,), value), 
+                                           err_msg='Unexpected values written for variable {0}'.format(variable_name))
+
+#--------------------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
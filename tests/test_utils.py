@@ -265,7 +265,32 @@ class UtilsTestCase(unittest.TestCase):
                                expected_rmse, 
                                msg='Incorrect root mean square error (RMSE)',
                                delta=0.001)
-        
+
+        # a NaN in either array should result in a NaN
+        vals1[2] = np.NaN
+        self.assertTrue(np.isnan(utils.rmse(vals1, vals2)),
+                        msg='Expected NaN root mean square error (RMSE) for input containing NaN')
+
+        # masked elements (here the NaN, masked as netCDF4 would mask it) should be skipped rather than propagated
+        masked_vals1 = np.ma.masked_invalid(vals1)
+        self.assertAlmostEqual(utils.rmse(masked_vals1, vals2), 
+                               np.sqrt(np.mean((np.delete(vals1, 2) - np.delete(vals2, 2)) ** 2)), 
+                               msg='Incorrect root mean square error (RMSE) for masked input',
+                               delta=0.001)
+        self.assertAlmostEqual(utils.rmse(vals2, masked_vals1), 
+                               utils.rmse(masked_vals1, vals2), 
+                               msg='Incorrect root mean square error (RMSE) for masked targets',
+                               delta=0.001)
+
+        # arrays of compatible shapes should be broadcast against each other
+        self.assertAlmostEqual(utils.rmse(np.array([[1.0, 2.0], [3.0, 4.0]]), np.array([1.0, 2.0])), 
+                               np.sqrt(2.0), 
+                               msg='Incorrect root mean square error (RMSE) for broadcast input',
+                               delta=0.001)
+
+        # make sure that the function croaks with a ValueError whenever it gets mismatched arrays
+        np.testing.assert_raises(ValueError, utils.rmse, vals1, vals2[:-1])
+
     #----------------------------------------------------------------------------------------
     def test_transform_to_gregorian(self):
         '''